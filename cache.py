@@ -0,0 +1,169 @@
+"""
+A content addressed cache of simplex solutions.
+Problems are hashed from their normalized coefficients, constraints and objective. Results are kept
+in a byte bounded LRU in memory and optionally in a directory on disk that survives restarts.
+"""
+
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+from simplex import Simplex
+
+
+def normalize(array, shape=None):
+    """Converts an array to contiguous float64 so equal problems always hash to the same bytes."""
+    array = np.ascontiguousarray(array, dtype='float64')
+    if shape is not None:
+        array = array.reshape(shape)
+    return array
+
+
+def hash_arrays(*arrays):
+    """Returns a hex digest covering the shapes and contents of the given arrays."""
+    digest = hashlib.sha256()
+    for array in arrays:
+        digest.update(str(array.shape).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+class CacheEntry:
+    """The stored outcome of a simplex run. The arrays are read only as entries are shared between callers."""
+    def __init__(self, status='optimal', value=0.0, solution=None, basis=None):
+        self.status = status
+        self.value = value
+        self.solution = np.zeros((0, 1), dtype='float') if solution is None else solution
+        self.basis = np.zeros(0, dtype='int') if basis is None else basis
+        self.solution.setflags(write=False)
+        self.basis.setflags(write=False)
+
+    @property
+    def is_optimal(self):
+        return self.status == 'optimal'
+
+    @property
+    def is_unbounded(self):
+        return self.status == 'unbounded'
+
+    @property
+    def nbytes(self):
+        return self.solution.nbytes + self.basis.nbytes
+
+    @classmethod
+    def from_simplex(cls, simplex):
+        """Creates an entry from a simplex that has been run."""
+        if simplex.status != 'optimal':
+            return cls(status=simplex.status, value=float(simplex.value), basis=simplex.obtain_basis_columns())
+        return cls(status='optimal', value=float(simplex.value), solution=simplex.solution.copy(),
+                   basis=simplex.obtain_basis_columns())
+
+
+class SolutionCache:
+    """Class to cache simplex results in front of `Simplex.run`."""
+    def __init__(self, max_bytes=64 * 1024 * 1024, directory=None, max_structures=1024):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_structures = max_structures
+        self.entries = OrderedDict()
+        self.structures = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.warm_starts = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @property
+    def statistics(self):
+        """Hit, miss and size statistics for the cache."""
+        lookups = self.hits + self.misses
+        return {'hits': self.hits,
+                'misses': self.misses,
+                'warm_starts': self.warm_starts,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'entries': len(self.entries),
+                'bytes': self.bytes}
+
+    def keys(self, coefficients, constraints, objective):
+        """Returns the problem key, the structure key, which ignores the constraints, and the normalized arrays.
+        Raises ValueError for negative constraints, which simplex cannot start from."""
+        coefficients = normalize(coefficients)
+        constraints = normalize(constraints, (-1, 1))
+        if np.any(constraints < 0):
+            raise ValueError('constraints must be non-negative')
+        objective = normalize(objective, (-1,))
+        structure_key = hash_arrays(coefficients, objective)
+        return hash_arrays(coefficients, constraints, objective), structure_key, (coefficients, constraints, objective)
+
+    def path(self, key):
+        return os.path.join(self.directory, key + '.npz')
+
+    def get(self, key):
+        """Looks an entry up in memory, then on disk."""
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        if self.directory is not None and os.path.exists(self.path(key)):
+            with np.load(self.path(key)) as stored:
+                entry = CacheEntry(status=str(stored['status']), value=float(stored['value']),
+                                   solution=stored['solution'], basis=stored['basis'])
+            self.remember(key, entry)
+            return entry
+        return None
+
+    def put(self, key, structure_key, entry):
+        """Stores an entry in memory and, if configured, on disk."""
+        self.remember(key, entry)
+        self.structures[structure_key] = entry.basis
+        self.structures.move_to_end(structure_key)
+        while len(self.structures) > self.max_structures:
+            self.structures.popitem(last=False)
+        if self.directory is not None:
+            temporary_path = self.path(key) + '.tmp.npz'
+            np.savez(temporary_path, status=entry.status, value=entry.value,
+                     solution=entry.solution, basis=entry.basis)
+            os.replace(temporary_path, self.path(key))
+            np.save(os.path.join(self.directory, structure_key + '.basis.npy'), entry.basis)
+
+    def remember(self, key, entry):
+        """Adds an entry to the in memory LRU, evicting the least recently used to stay within bounds."""
+        if key in self.entries:
+            self.bytes -= self.entries.pop(key).nbytes
+        self.entries[key] = entry
+        self.bytes += entry.nbytes
+        while self.bytes > self.max_bytes and len(self.entries) > 1:
+            _, evicted = self.entries.popitem(last=False)
+            self.bytes -= evicted.nbytes
+
+    def warm_start_basis(self, structure_key):
+        """Returns a basis from a previous solve with the same coefficients and objective, if any."""
+        if structure_key in self.structures:
+            self.structures.move_to_end(structure_key)
+            return self.structures[structure_key]
+        if self.directory is not None:
+            path = os.path.join(self.directory, structure_key + '.basis.npy')
+            if os.path.exists(path):
+                return np.load(path)
+        return None
+
+    def run(self, coefficients, constraints, objective, max_iterations=None, time_limit=None, cancellation=None):
+        """Returns the cached result for a problem, running simplex on a miss.
+        Results of solves stopped by a limit or cancellation are returned but not stored."""
+        key, structure_key, (coefficients, constraints, objective) = self.keys(coefficients, constraints, objective)
+        entry = self.get(key)
+        if entry is not None:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        simplex = Simplex(coefficients=coefficients, constraints=constraints, objective=objective)
+        basis = self.warm_start_basis(structure_key)
+        status = simplex.run(basis_columns=basis, max_iterations=max_iterations, time_limit=time_limit,
+                             cancellation=cancellation)
+        if simplex.is_warm_started:
+            self.warm_starts += 1
+        entry = CacheEntry.from_simplex(simplex)
+        if status in ('optimal', 'unbounded'):
+            self.put(key, structure_key, entry)
+        return entry
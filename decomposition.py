@@ -0,0 +1,199 @@
+"""
+Dantzig-Wolfe decomposition for block angular problems.
+The constraint rows are split into a few linking rows and independent blocks. Each block's pricing
+subproblem is solved by its own simplex, optionally in a separate process, and the blocks are
+coordinated through a restricted master problem over their extreme points and rays.
+"""
+
+import numpy as np
+from simplex import Simplex
+
+
+class Block:
+    """The rows and columns of one independent block of a block angular problem."""
+    def __init__(self, rows, columns):
+        self.rows = np.asarray(rows, dtype='int')
+        self.columns = np.asarray(columns, dtype='int')
+
+
+def detect_blocks(coefficients, linking_rows):
+    """Splits the non linking rows into independent blocks by grouping rows which share a variable.
+    Variables which only appear in linking rows become blocks without rows."""
+    coefficients = np.asarray(coefficients, dtype='float')
+    number_of_rows, number_of_columns = coefficients.shape
+    is_linking = np.zeros(number_of_rows, dtype='bool')
+    is_linking[list(linking_rows)] = True
+    # Union find over the columns, joining every column used by the same block row.
+    parents = np.arange(number_of_columns)
+
+    def find(column):
+        while parents[column] != column:
+            parents[column] = parents[parents[column]]
+            column = parents[column]
+        return column
+
+    # The first column of each non empty block row, whose root later assigns the row to a block.
+    block_rows = []
+    first_columns = []
+    for row_index in np.flatnonzero(~is_linking):
+        columns = np.flatnonzero(coefficients[row_index])
+        if columns.size == 0:
+            continue
+        block_rows.append(row_index)
+        first_columns.append(columns[0])
+        root = find(columns[0])
+        for column in columns[1:]:
+            parents[find(column)] = root
+    roots = np.array([find(column) for column in range(number_of_columns)], dtype='int')
+    if number_of_columns == 0:
+        return []
+    block_roots, column_blocks = np.unique(roots, return_inverse=True)
+    row_blocks = column_blocks[np.array(first_columns, dtype='int')]
+    # Stable sorts keep the rows and columns of each block in their original order.
+    column_order = np.argsort(column_blocks, kind='stable')
+    row_order = np.array(block_rows, dtype='int')[np.argsort(row_blocks, kind='stable')]
+    column_groups = np.split(column_order, np.cumsum(np.bincount(column_blocks))[:-1])
+    row_groups = np.split(row_order, np.cumsum(np.bincount(row_blocks, minlength=block_roots.shape[0]))[:-1])
+    return [Block(rows=rows, columns=columns) for rows, columns in zip(row_groups, column_groups)]
+
+
+def price_block(coefficients, constraints, objective):
+    """Solves a block pricing subproblem.
+    Returns whether the result is an extreme point or ray, the point or ray, and its objective value.
+    If the subproblem neither reaches an optimum nor proves unboundedness, its status is returned instead
+    of the kind, without a vector or value."""
+    if coefficients.shape[0] == 0:
+        # A block without rows is the non-negative orthant.
+        if objective.size and np.max(objective) > 0:
+            ray = np.zeros(objective.shape, dtype='float')
+            ray[np.argmax(objective)] = 1
+            return 'ray', ray, float(np.max(objective))
+        return 'point', np.zeros(objective.shape, dtype='float'), 0.0
+    simplex = Simplex(coefficients=coefficients, constraints=constraints, objective=objective)
+    simplex.run()
+    if simplex.is_unbounded:
+        ray = simplex.ray.flatten()
+        return 'ray', ray, float(np.dot(objective, ray))
+    if simplex.status != 'optimal':
+        return simplex.status, None, None
+    return 'point', simplex.solution.flatten(), float(simplex.value)
+
+
+class DantzigWolfe:
+    """Class to preform Dantzig-Wolfe decomposition of a block angular simplex problem."""
+    def __init__(self,
+                 coefficients=np.array([[]], dtype='float'),
+                 constraints=np.array([[]], dtype='float'),
+                 objective=np.array([], dtype='float'),
+                 linking_rows=(),
+                 blocks=None,
+                 executor=None):
+        self.coefficients = np.asarray(coefficients, dtype='float')
+        self.constraints = np.asarray(constraints, dtype='float').reshape((-1, 1))
+        self.objective = np.asarray(objective, dtype='float').flatten()
+        self.linking_rows = np.asarray(linking_rows, dtype='int')
+        self.blocks = detect_blocks(self.coefficients, self.linking_rows) if blocks is None else blocks
+        self.executor = executor
+        self.tolerance = 1e-9
+        # The master columns, each an extreme point or ray of one block.
+        self.proposals = []
+        self.master_coefficients = np.zeros((self.linking_rows.shape[0] + len(self.blocks), 0), dtype='float')
+        self.master_objective = np.array([], dtype='float')
+        self.master = None
+        self.value = 0
+        self.solution = np.array([[]], dtype='float')
+        self.is_optimal = False
+        self.is_unbounded = False
+        self.status = None
+        self.iteration = 0
+
+    def block_problem(self, block, prices):
+        """Returns the pricing subproblem of a block for the given linking row prices."""
+        linking = self.coefficients[np.ix_(self.linking_rows, block.columns)]
+        objective = self.objective[block.columns] - prices.dot(linking)
+        return (self.coefficients[np.ix_(block.rows, block.columns)],
+                self.constraints[block.rows],
+                objective)
+
+    def price(self, prices):
+        """Solves every block's pricing subproblem, in the executor if one is given."""
+        problems = [self.block_problem(block, prices) for block in self.blocks]
+        if self.executor is None:
+            return [price_block(*problem) for problem in problems]
+        futures = [self.executor.submit(price_block, *problem) for problem in problems]
+        return [future.result() for future in futures]
+
+    def add_proposal(self, block_index, kind, vector):
+        """Adds a block's extreme point or ray as a new column of the master problem."""
+        block = self.blocks[block_index]
+        column = np.zeros(self.master_coefficients.shape[0], dtype='float')
+        column[:self.linking_rows.shape[0]] = self.coefficients[np.ix_(self.linking_rows, block.columns)].dot(vector)
+        if kind == 'point':
+            column[self.linking_rows.shape[0] + block_index] = 1
+        self.master_coefficients = np.append(self.master_coefficients, column.reshape((-1, 1)), axis=1)
+        self.master_objective = np.append(self.master_objective, self.objective[block.columns].dot(vector))
+        self.proposals.append((block_index, vector))
+
+    def solve_master(self, basis_columns=None):
+        """Solves the restricted master problem. The convexity rows are written as at most one, which
+        is equivalent since the origin is in every block when the constraints are non-negative."""
+        master_constraints = np.append(self.constraints[self.linking_rows],
+                                       np.ones((len(self.blocks), 1), dtype='float'), axis=0)
+        self.master = Simplex(coefficients=self.master_coefficients.copy(), constraints=master_constraints,
+                              objective=self.master_objective.copy())
+        return self.master.run(basis_columns=basis_columns)
+
+    def obtain_solution(self):
+        """Combines the block proposals weighted by the master solution."""
+        self.solution = np.zeros((self.coefficients.shape[1], 1), dtype='float')
+        weights = self.master.solution.flatten()
+        for (block_index, vector), weight in zip(self.proposals, weights):
+            self.solution[self.blocks[block_index].columns, 0] += weight * vector
+
+    def run(self, max_iterations=100):
+        """Run complete decomposition. Returns the final status."""
+        if np.any(self.constraints < 0):
+            raise ValueError('constraints must be non-negative')
+        number_of_linking_rows = self.linking_rows.shape[0]
+        prices = np.zeros(number_of_linking_rows, dtype='float')
+        convexity_prices = np.zeros(len(self.blocks), dtype='float')
+        basis_columns = None
+        self.status = 'running'
+        for iteration in range(max_iterations):
+            self.iteration = iteration
+            # Price out new columns from every block.
+            proposals_added = 0
+            results = self.price(prices)
+            failed = [kind for kind, _, _ in results if kind not in ('point', 'ray')]
+            if failed:
+                self.status = failed[0]
+                break
+            for block_index, (kind, vector, value) in enumerate(results):
+                reduced_cost = value - convexity_prices[block_index] if kind == 'point' else value
+                if reduced_cost > self.tolerance:
+                    self.add_proposal(block_index, kind, vector)
+                    proposals_added += 1
+            if self.master is not None and proposals_added == 0:
+                self.status = 'optimal'
+                break
+            # Warm start the master, shifting the slack columns past the new proposals.
+            if self.master is not None:
+                basis_columns = self.master.obtain_basis_columns()
+                basis_columns[basis_columns >= self.master.number_of_variables] += proposals_added
+            master_status = self.solve_master(basis_columns)
+            if master_status != 'optimal':
+                self.status = master_status
+                break
+            duals = self.master.duals.flatten()
+            prices = duals[:number_of_linking_rows]
+            convexity_prices = duals[number_of_linking_rows:]
+        else:
+            self.status = 'iteration_limit'
+        if self.status == 'unbounded':
+            self.is_unbounded = True
+            self.value = float('inf')
+        elif self.master is not None and self.master.status == 'optimal':
+            self.is_optimal = self.status == 'optimal'
+            self.value = self.master.value
+            self.obtain_solution()
+        return self.status
@@ -69,46 +69,32 @@ class Display:
         """Run simplex with display."""
         # Display the starting tableau.
         self.display_tableau()
-        self.simplex.calculate_basis_value()
-        while True:
-            # Calculate reduced costs.
-            self.simplex.calculate_reduced_costs()
-            self.color_dict['reduced'] = [star for _ in self.color_dict['reduced']]
-            self.display_tableau()
-            # End if the solution is optimal or unbounded.
-            if self.simplex.check_if_optimal():
-                self.simplex.obtain_solution()
-                self.simplex.value = np.inner(self.simplex.objective[0:self.simplex.number_of_variables],
-                                              self.simplex.solution.flatten())
+        for step in self.simplex.steps(initialize=False):
+            if step.phase == 'reduced_costs':
+                self.color_dict['reduced'] = [star for _ in self.color_dict['reduced']]
+                self.display_tableau()
+            elif step.phase == 'optimal':
                 self.display_optimal()
-                return
-            if self.simplex.check_if_unbounded():
-                self.simplex.value = float('inf')
+            elif step.phase == 'unbounded':
                 self.display_unbounded()
-                return
-            # Determine the pivot.
-            self.simplex.obtain_pivot_column_index()
-            self.simplex.obtain_pivot_row_index()
-            self.color_dict['reduced'][self.simplex.pivot_column_index] = star
-            self.color_dict['ratio'] = [star for _ in self.color_dict['ratio']]
-            self.display_tableau()
-            self.color_dict['reduced'][self.simplex.pivot_column_index] = star
-            self.color_dict['ratio'][self.simplex.pivot_row_index] = star
-            self.color_dict['coefficients'][self.simplex.pivot_row_index][self.simplex.pivot_column_index] = star
-            self.display_tableau()
-            # Perform pivot.
-            self.simplex.make_pivot_element_one()
-            self.simplex.make_pivot_independent()
-            self.color_dict['coefficients'][self.simplex.pivot_row_index][self.simplex.pivot_column_index] = star
-            self.display_tableau()
-            self.simplex.swap_basis_variable()
-            self.color_dict['bv'][self.simplex.pivot_row_index] = star
-            self.color_dict['cb'][self.simplex.pivot_row_index] = star
-            self.color_dict['variables'][self.simplex.pivot_column_index] = star
-            self.color_dict['objective'][self.simplex.pivot_column_index] = star
-            self.simplex.calculate_basis_value()
-            self.color_dict['value'] = star
-            self.display_tableau()
+            elif step.phase == 'pivot_selected':
+                self.color_dict['reduced'][step.pivot_column_index] = star
+                self.color_dict['ratio'] = [star for _ in self.color_dict['ratio']]
+                self.display_tableau()
+                self.color_dict['reduced'][step.pivot_column_index] = star
+                self.color_dict['ratio'][step.pivot_row_index] = star
+                self.color_dict['coefficients'][step.pivot_row_index][step.pivot_column_index] = star
+                self.display_tableau()
+            elif step.phase == 'pivoted':
+                self.color_dict['coefficients'][step.pivot_row_index][step.pivot_column_index] = star
+                self.display_tableau()
+            elif step.phase == 'swapped':
+                self.color_dict['bv'][step.pivot_row_index] = star
+                self.color_dict['cb'][step.pivot_row_index] = star
+                self.color_dict['variables'][step.pivot_column_index] = star
+                self.color_dict['objective'][step.pivot_column_index] = star
+                self.color_dict['value'] = star
+                self.display_tableau()
 
     def display_tableau(self):
         """Show only the tableau."""
@@ -148,7 +134,7 @@ class Display:
         main_rows = []
         for basis_index in range(self.simplex.basis_size):
             row = r""
-            variable = self.simplex.basis_variables[basis_index]
+            variable = self.simplex.basis_variable(basis_index)
             objective = self.simplex.basis_objective[basis_index][0]
             solution = self.simplex.basis_solution[basis_index][0]
             coefficients = self.simplex.coefficients[basis_index].flatten()
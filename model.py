@@ -0,0 +1,126 @@
+"""
+An incremental builder for simplex problems.
+Variables and constraints are added in vectorized calls and the nonzero coefficients are stored in
+coordinate (COO) form in growable typed arrays until the problem is handed to simplex.
+"""
+
+import numpy as np
+from simplex import Simplex
+
+
+class GrowableArray:
+    """A typed one dimensional array which grows geometrically as values are appended."""
+    def __init__(self, dtype='float', capacity=16):
+        self.buffer = np.zeros(capacity, dtype=dtype)
+        self.size = 0
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def values(self):
+        """A view of the values appended so far."""
+        return self.buffer[:self.size]
+
+    def reserve(self, capacity):
+        """Makes sure the buffer can hold at least the given number of values."""
+        if capacity > self.buffer.shape[0]:
+            buffer = np.zeros(max(capacity, 2 * self.buffer.shape[0]), dtype=self.buffer.dtype)
+            buffer[:self.size] = self.values
+            self.buffer = buffer
+
+    def extend(self, values):
+        """Appends an array of values."""
+        values = np.asarray(values, dtype=self.buffer.dtype).flatten()
+        self.reserve(self.size + values.shape[0])
+        self.buffer[self.size:self.size + values.shape[0]] = values
+        self.size += values.shape[0]
+
+
+class Model:
+    """Class to build a simplex problem, maximizing the objective subject to the constraint upper bounds."""
+    def __init__(self):
+        self.objective = GrowableArray(dtype='float')
+        self.upper_bounds = GrowableArray(dtype='float')
+        self.rows = GrowableArray(dtype='int64')
+        self.columns = GrowableArray(dtype='int64')
+        self.values = GrowableArray(dtype='float')
+
+    @property
+    def number_of_variables(self):
+        return len(self.objective)
+
+    @property
+    def number_of_constraints(self):
+        return len(self.upper_bounds)
+
+    @property
+    def number_of_nonzeros(self):
+        return len(self.values)
+
+    def add_variables(self, count, objective=None, rows=(), columns=(), values=()):
+        """Adds variables with the given objective coefficients (zero if not given). Their nonzero
+        coefficients in existing constraints are given as arrays of constraint rows, columns relative to
+        the first new variable, and values. Returns the indices of the new variables."""
+        rows = np.asarray(rows, dtype='int64').flatten()
+        columns = np.asarray(columns, dtype='int64').flatten()
+        values = np.asarray(values, dtype='float').flatten()
+        if not rows.shape == columns.shape == values.shape:
+            raise ValueError('rows, columns and values must have the same length')
+        if columns.size and (columns.min() < 0 or columns.max() >= count):
+            raise ValueError('columns must refer to the variables being added')
+        if rows.size and (rows.min() < 0 or rows.max() >= self.number_of_constraints):
+            raise ValueError('rows must refer to existing constraints')
+        start = self.number_of_variables
+        self.objective.extend(np.zeros(count) if objective is None else np.broadcast_to(objective, (count,)))
+        self.rows.extend(rows)
+        self.columns.extend(columns + start)
+        self.values.extend(values)
+        return np.arange(start, start + count)
+
+    def set_objective(self, columns, values):
+        """Sets the objective coefficients of existing variables."""
+        columns = np.asarray(columns, dtype='int64')
+        self.check_columns(columns)
+        self.objective.values[columns] = values
+
+    def add_constraints(self, upper_bounds, rows=(), columns=(), values=()):
+        """Adds constraints with the given upper bounds. The nonzero coefficients are given as arrays of
+        rows, relative to the first new constraint, variable columns and values.
+        Returns the indices of the new constraints."""
+        upper_bounds = np.asarray(upper_bounds, dtype='float').flatten()
+        if np.any(upper_bounds < 0):
+            raise ValueError('upper bounds must be non-negative')
+        rows = np.asarray(rows, dtype='int64').flatten()
+        columns = np.asarray(columns, dtype='int64').flatten()
+        values = np.asarray(values, dtype='float').flatten()
+        if not rows.shape == columns.shape == values.shape:
+            raise ValueError('rows, columns and values must have the same length')
+        if rows.size and (rows.min() < 0 or rows.max() >= upper_bounds.shape[0]):
+            raise ValueError('rows must refer to the constraints being added')
+        self.check_columns(columns)
+        start = self.number_of_constraints
+        self.upper_bounds.extend(upper_bounds)
+        self.rows.extend(rows + start)
+        self.columns.extend(columns)
+        self.values.extend(values)
+        return np.arange(start, start + upper_bounds.shape[0])
+
+    def check_columns(self, columns):
+        """Raises if any of the columns are not existing variables."""
+        if columns.size and (columns.min() < 0 or columns.max() >= self.number_of_variables):
+            raise ValueError('columns must refer to existing variables')
+
+    def to_arrays(self):
+        """Returns the dense coefficients, constraints and objective arrays. Repeated entries are summed."""
+        shape = (self.number_of_constraints, self.number_of_variables)
+        flat_indices = self.rows.values * shape[1] + self.columns.values
+        coefficients = np.bincount(flat_indices, weights=self.values.values,
+                                   minlength=shape[0] * shape[1]).reshape(shape)
+        return coefficients, self.upper_bounds.values.reshape((-1, 1)).copy(), self.objective.values.copy()
+
+    def to_simplex(self):
+        """Returns a simplex ready to run on the model. The dense coefficients are passed without copying,
+        though simplex copies them once more when it adds its slack columns."""
+        coefficients, constraints, objective = self.to_arrays()
+        return Simplex(coefficients=coefficients, constraints=constraints, objective=objective)
@@ -0,0 +1,278 @@
+"""
+A local asyncio service for solving simplex problems.
+Accepts LPs as newline delimited JSON over a Unix socket or TCP, queues them, batches
+same-shaped small problems together and runs large problems in a process pool.
+"""
+
+import asyncio
+import base64
+import json
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from simplex import Simplex
+
+
+def decode_array(value):
+    """Converts a JSON value into a float array. Accepts nested lists or a binary array object
+    of the form {"dtype": ..., "shape": [...], "data": <base64 bytes>}."""
+    if isinstance(value, dict):
+        data = base64.b64decode(value['data'])
+        array = np.frombuffer(data, dtype=value.get('dtype', 'float64'))
+        return array.reshape(value['shape']).astype('float')
+    return np.array(value, dtype='float')
+
+
+def decode_problem(message):
+    """Extracts the coefficients, constraints and objective arrays from a request message."""
+    coefficients = decode_array(message['coefficients'])
+    constraints = decode_array(message['constraints']).reshape((-1, 1))
+    objective = decode_array(message['objective']).flatten()
+    if coefficients.ndim != 2:
+        raise ValueError('coefficients must be a two dimensional array')
+    if constraints.shape[0] != coefficients.shape[0] or objective.shape[0] != coefficients.shape[1]:
+        raise ValueError('coefficients, constraints and objective have mismatched shapes')
+    if np.any(constraints < 0):
+        raise ValueError('constraints must be non-negative')
+    return coefficients, constraints, objective
+
+
+def solve_problem(coefficients, constraints, objective, time_limit=None):
+    """Runs simplex on a single problem and returns a JSON serializable result."""
+    if np.any(np.asarray(constraints) < 0):
+        raise ValueError('constraints must be non-negative')
+    simplex = Simplex(coefficients=coefficients, constraints=constraints, objective=objective)
+    status = simplex.run(time_limit=time_limit)
+    if status != 'optimal':
+        return {'status': status, 'value': None, 'solution': None}
+    return {'status': status,
+            'value': float(simplex.value),
+            'solution': simplex.solution.flatten().tolist()}
+
+
+def solve_batch(problems, time_limit=None):
+    """Solves a batch of problems in one call so the dispatch cost is paid once per batch.
+    The time limit is shared by the whole batch."""
+    results = []
+    deadline = None if time_limit is None else time.monotonic() + time_limit
+    for coefficients, constraints, objective in problems:
+        remaining = None if deadline is None else max(deadline - time.monotonic(), 0)
+        try:
+            results.append(solve_problem(coefficients, constraints, objective, time_limit=remaining))
+        except Exception as error:
+            results.append({'status': 'error', 'error': str(error)})
+    return results
+
+
+class SolveJob:
+    """A queued problem along with the connection to stream its status back to."""
+    def __init__(self, identifier, problem, writer):
+        self.identifier = identifier
+        self.problem = problem
+        self.writer = writer
+        self.done = asyncio.get_running_loop().create_future()
+
+    @property
+    def shape(self):
+        return self.problem[0].shape
+
+    @property
+    def size(self):
+        return self.problem[0].size
+
+
+class SolveService:
+    """Class to serve simplex solves to local processes."""
+    def __init__(self,
+                 small_problem_size=400,
+                 max_batch_size=32,
+                 batch_window=0.005,
+                 max_queue_size=1024,
+                 max_concurrency=4,
+                 timeout=30.0,
+                 timeout_grace=1.0,
+                 max_message_size=64 * 1024 * 1024,
+                 workers=None):
+        self.small_problem_size = small_problem_size
+        self.max_batch_size = max_batch_size
+        self.batch_window = batch_window
+        self.max_queue_size = max_queue_size
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.timeout_grace = timeout_grace
+        self.max_message_size = max_message_size
+        self.workers = workers
+        self.queue = None
+        self.semaphore = None
+        self.executor = None
+        self.server = None
+        self.dispatcher = None
+        self.tasks = set()
+
+    async def start(self, path=None, host='127.0.0.1', port=0):
+        """Starts listening on a Unix socket if a path is given, otherwise on TCP."""
+        self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        # Spawned rather than forked workers, so they do not inherit open client sockets.
+        self.executor = ProcessPoolExecutor(max_workers=self.workers,
+                                            mp_context=multiprocessing.get_context('spawn'))
+        if path is not None:
+            self.server = await asyncio.start_unix_server(self.handle_connection, path=path,
+                                                          limit=self.max_message_size)
+        else:
+            self.server = await asyncio.start_server(self.handle_connection, host=host, port=port,
+                                                     limit=self.max_message_size)
+        self.dispatcher = asyncio.ensure_future(self.dispatch())
+        return self.server
+
+    async def stop(self):
+        """Stops accepting connections, cancels outstanding work and shuts down the workers."""
+        self.server.close()
+        await self.server.wait_closed()
+        self.dispatcher.cancel()
+        for task in list(self.tasks):
+            task.cancel()
+        await asyncio.gather(self.dispatcher, *self.tasks, return_exceptions=True)
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+    async def send(self, writer, message):
+        """Writes a single status message to a client. A client which has disconnected is skipped,
+        so it cannot stop messages to the other clients of a batch."""
+        if writer.is_closing():
+            return
+        try:
+            writer.write(json.dumps(message).encode() + b'\n')
+            await writer.drain()
+        except ConnectionError:
+            writer.close()
+
+    async def read_line(self, reader):
+        """Reads one newline terminated message, or the remaining bytes at the end of the stream.
+        A message longer than the limit is discarded up to its newline, even when it arrives in
+        several chunks, and raises a single ValueError."""
+        try:
+            return await reader.readuntil(b'\n')
+        except asyncio.IncompleteReadError as error:
+            return error.partial
+        except asyncio.LimitOverrunError as error:
+            consumed = error.consumed
+        while True:
+            await reader.readexactly(consumed)
+            try:
+                await reader.readuntil(b'\n')
+                break
+            except asyncio.IncompleteReadError:
+                break
+            except asyncio.LimitOverrunError as error:
+                consumed = error.consumed
+        raise ValueError('message longer than {} bytes'.format(self.max_message_size))
+
+    async def handle_connection(self, reader, writer):
+        """Reads requests from a client. Reading stops while the queue is full, which applies
+        backpressure to the client through the socket."""
+        pending = []
+        try:
+            while True:
+                try:
+                    line = await self.read_line(reader)
+                except ValueError as error:
+                    await self.send(writer, {'id': None, 'status': 'error', 'error': str(error)})
+                    continue
+                if not line:
+                    break
+                identifier = None
+                try:
+                    message = json.loads(line)
+                    if not isinstance(message, dict):
+                        raise TypeError('message must be a JSON object')
+                    identifier = message.get('id')
+                    problem = decode_problem(message)
+                except (ValueError, KeyError, TypeError) as error:
+                    await self.send(writer, {'id': identifier, 'status': 'error', 'error': str(error)})
+                    continue
+                job = SolveJob(identifier, problem, writer)
+                pending.append(job.done)
+                await self.queue.put(job)
+                await self.send(writer, {'id': identifier, 'status': 'queued'})
+            await asyncio.gather(*pending, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def collect_jobs(self, job):
+        """Gathers further queued jobs for a short window after a small job arrives."""
+        jobs = [job]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_window
+        while len(jobs) < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                jobs.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return jobs
+
+    def group_jobs(self, jobs):
+        """Groups small jobs of the same shape into batches. Large jobs each run on their own."""
+        batches = []
+        small_jobs_by_shape = {}
+        for job in jobs:
+            if job.size <= self.small_problem_size:
+                small_jobs_by_shape.setdefault(job.shape, []).append(job)
+            else:
+                batches.append([job])
+        for shape_jobs in small_jobs_by_shape.values():
+            for start in range(0, len(shape_jobs), self.max_batch_size):
+                batches.append(shape_jobs[start:start + self.max_batch_size])
+        return batches
+
+    async def dispatch(self):
+        """Takes jobs off the queue and starts them, respecting the concurrency limit."""
+        while True:
+            job = await self.queue.get()
+            jobs = await self.collect_jobs(job) if job.size <= self.small_problem_size else [job]
+            for batch in self.group_jobs(jobs):
+                await self.semaphore.acquire()
+                task = asyncio.ensure_future(self.run_jobs(batch))
+                self.tasks.add(task)
+                task.add_done_callback(self.tasks.discard)
+
+    async def run_jobs(self, jobs):
+        """Runs a group of jobs in the worker pool and streams the results back."""
+        loop = asyncio.get_running_loop()
+        try:
+            for job in jobs:
+                await self.send(job.writer, {'id': job.identifier, 'status': 'running'})
+            problems = [job.problem for job in jobs]
+            try:
+                results = await asyncio.wait_for(
+                    loop.run_in_executor(self.executor, solve_batch, problems, self.timeout),
+                    self.timeout + self.timeout_grace)
+            except asyncio.TimeoutError:
+                results = [{'status': 'timeout'}] * len(jobs)
+            except Exception as error:
+                results = [{'status': 'error', 'error': str(error)}] * len(jobs)
+            for job, result in zip(jobs, results):
+                await self.send(job.writer, dict(result, id=job.identifier))
+        finally:
+            self.semaphore.release()
+            for job in jobs:
+                if not job.done.done():
+                    job.done.set_result(None)
+
+
+async def serve(path=None, host='127.0.0.1', port=8765, **kwargs):
+    """Runs the solve service until cancelled."""
+    service = SolveService(**kwargs)
+    server = await service.start(path=path, host=host, port=port)
+    try:
+        await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(serve())
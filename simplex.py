@@ -3,32 +3,65 @@ The class for solving simplex.
 Given a standard LPP, finds the optimal solution through simplex method.
 """
 
+import time
 import numpy as np
 from variable import Variable
 
+BASIC = 0
+NONBASIC_AT_LOWER = 1
+
+
+class Step:
+    """The light state of a simplex solve at one phase of an iteration."""
+    def __init__(self, phase, iteration=0, pivot_column_index=None, pivot_row_index=None,
+                 leaving_column_index=None, value=0):
+        self.phase = phase
+        self.iteration = iteration
+        self.pivot_column_index = pivot_column_index
+        self.pivot_row_index = pivot_row_index
+        self.leaving_column_index = leaving_column_index
+        self.value = value
+
+
 class Simplex:
     """Class to preform simplex."""
     def __init__(self,
                  coefficients=np.array([[]], dtype='float'),
                  constraints=np.array([[]], dtype='float'),
                  objective=np.array([], dtype='float')):
-        self.coefficients = coefficients
-        self.constraints = constraints
+        self.coefficients = np.asarray(coefficients, dtype='float')
+        self.constraints = np.asarray(constraints, dtype='float')
         self.basis_objective = np.array([[]], dtype='float')
         self.basis_solution = np.array([[]], dtype='float')
         self.basis_value = 0
         self.value = 0
         self.solution = np.array([[]], dtype='float')
+        self.duals = np.array([[]], dtype='float')
         self.reduced_costs = np.array([[]], dtype='float')
         self.least_positive_ratio = np.array([[]], dtype='float')
-        self.basis_variables = []
-        self.objective = objective
+        self.basis_indices = np.array([], dtype='int')
+        self.basis_positions = np.array([], dtype='int')
+        self.nonbasic_status = np.array([], dtype='uint8')
+        self.objective = np.asarray(objective, dtype='float')
         self.basis_size = 0
         self.pivot_column_index = None
         self.pivot_row_index = None
+        self.leaving_column_index = None
         self.is_optimal = False
         self.is_unbounded = False
+        self.unbounded_column_index = None
+        self.ray = np.array([[]], dtype='float')
+        self.is_warm_started = False
+        self.status = None
+        self.iteration = 0
         self.number_of_variables = 0
+        self.feasibility_tolerance = 1e-9
+        self.optimality_tolerance = 1e-9
+        self.pivot_tolerance = 1e-9
+        self.degenerate_pivot_limit = 5
+        self.perturbation_scale = 1e-6
+        self.degenerate_pivots = 0
+        self.is_perturbed = False
 
     def initialize_slack(self):
         """Adds the slack identity matrix to the A matrix."""
@@ -40,12 +73,36 @@ class Simplex:
     def initialize_basis(self):
         """Sets up the initial basis."""
         self.basis_size = self.constraints.shape[0]
-        self.basis_solution = self.constraints
+        self.basis_solution = self.constraints.copy()
         self.basis_objective = np.zeros(self.constraints.shape, dtype='float')
         self.basis_value = 0
-        self.basis_variables = []
-        for index in range(self.constraints.shape[0]):
-            self.basis_variables.append(Variable(index=index, is_slack=True))
+        self.is_perturbed = False
+        self.set_basis(self.number_of_variables + np.arange(self.basis_size))
+
+    def set_basis(self, basis_indices):
+        """Sets the basis column of each row and rebuilds the basis position and nonbasic status arrays."""
+        self.basis_indices = np.array(basis_indices, dtype='int')
+        number_of_columns = self.number_of_variables + self.basis_indices.shape[0]
+        self.basis_positions = np.full(number_of_columns, -1, dtype='int')
+        self.basis_positions[self.basis_indices] = np.arange(self.basis_indices.shape[0])
+        self.nonbasic_status = np.full(number_of_columns, NONBASIC_AT_LOWER, dtype='uint8')
+        self.nonbasic_status[self.basis_indices] = BASIC
+
+    @property
+    def basis_variables(self):
+        """The basis as a list of variable views, one per row."""
+        return [self.basis_variable(row_index) for row_index in range(self.basis_indices.shape[0])]
+
+    @basis_variables.setter
+    def basis_variables(self, variables):
+        """Sets the basis from variables. The number of original variables is needed to find the columns."""
+        if self.number_of_variables == 0 and len(variables) > 0:
+            raise ValueError('number_of_variables must be set before assigning basis variables')
+        self.set_basis([variable.column(self.number_of_variables) for variable in variables])
+
+    def basis_variable(self, row_index):
+        """Returns a view of the basis variable in the given row."""
+        return Variable.from_column(self.basis_indices[row_index], self.number_of_variables)
 
     def initialize_tableau(self):
         """Sets up the initial tableau values."""
@@ -67,7 +124,7 @@ class Simplex:
     def check_if_optimal(self):
         """Checks if the solution is optimal."""
         for reduced_cost in self.reduced_costs:
-            if reduced_cost < 0:
+            if reduced_cost < -self.optimality_tolerance:
                 return False
         self.is_optimal = True
         return True
@@ -75,9 +132,10 @@ class Simplex:
     def check_if_unbounded(self):
         """Checks if the solution is unbounded."""
         for index, reduced_cost in enumerate(self.reduced_costs):
-            if reduced_cost < 0:
+            if reduced_cost < -self.optimality_tolerance:
                 column = self.coefficients.T[index]
-                if all(value <= 0 for value in column):
+                if all(value <= self.pivot_tolerance for value in column):
+                    self.unbounded_column_index = index
                     self.is_unbounded = True
                     return True
         return False
@@ -87,10 +145,70 @@ class Simplex:
         self.pivot_column_index =  np.argmin(self.reduced_costs)
 
     def obtain_pivot_row_index(self):
-        """Return the row on which to pivot."""
+        """Return the row on which to pivot using the Harris ratio test.
+        Runs of zero length steps turn on the bound perturbation, after which the ratio test is repeated
+        on the perturbed basis solution."""
+        self.harris_ratio_test()
+        # Track runs of zero length steps and perturb the bounds if they persist.
+        if self.basis_solution[self.pivot_row_index][0] <= self.feasibility_tolerance:
+            self.degenerate_pivots += 1
+        else:
+            self.degenerate_pivots = 0
+        if self.degenerate_pivots >= self.degenerate_pivot_limit and not self.is_perturbed:
+            self.perturb()
+            self.harris_ratio_test()
+
+    def harris_ratio_test(self):
+        """Sets the pivot row with the Harris two pass ratio test.
+        The first pass finds the largest step that keeps every basis variable within the feasibility
+        tolerance, the second picks the largest pivot element among the rows limiting within that step."""
         pivot_column = self.coefficients.T[self.pivot_column_index]
-        self.least_positive_ratio = np.divide(self.basis_solution.flatten(), pivot_column)
-        self.pivot_row_index = np.argmin([ratio if ratio > 0 else float('inf') for ratio in self.least_positive_ratio])
+        basis_solution = np.maximum(self.basis_solution.flatten(), 0)
+        is_eligible = pivot_column > self.pivot_tolerance
+        self.least_positive_ratio = np.full(pivot_column.shape, float('inf'))
+        self.least_positive_ratio[is_eligible] = basis_solution[is_eligible] / pivot_column[is_eligible]
+        relaxed_ratios = (basis_solution[is_eligible] + self.feasibility_tolerance) / pivot_column[is_eligible]
+        maximum_step = np.min(relaxed_ratios)
+        candidates = np.where(self.least_positive_ratio <= maximum_step, np.abs(pivot_column), -1)
+        self.pivot_row_index = np.argmax(candidates)
+
+    def perturb(self):
+        """Adds small random positive amounts to the basis solution to break degeneracy."""
+        random = np.random.default_rng(0)
+        magnitudes = self.perturbation_scale * (1 + np.abs(self.basis_solution))
+        self.basis_solution += magnitudes * random.uniform(0.5, 1.0, size=self.basis_solution.shape)
+        self.is_perturbed = True
+
+    def remove_perturbation(self):
+        """Recomputes the basis solution from the original constraints. The slack columns of the
+        tableau hold the inverse of the basis."""
+        basis_inverse = self.coefficients[:, self.number_of_variables:self.number_of_variables + self.basis_size]
+        self.basis_solution = basis_inverse.dot(self.constraints.reshape((-1, 1)))
+        self.is_perturbed = False
+        self.calculate_basis_value()
+
+    def restore_feasibility(self):
+        """Restores primal feasibility of an optimal basis with dual simplex pivots, which keep the reduced
+        costs non-negative. Returns False if feasibility could not be restored."""
+        for _ in range(50 * max(self.basis_size, 1)):
+            row_index = np.argmin(self.basis_solution)
+            if self.basis_solution[row_index][0] >= -self.feasibility_tolerance:
+                self.basis_solution[np.abs(self.basis_solution) <= self.feasibility_tolerance] = 0
+                self.calculate_basis_value()
+                return True
+            row = self.coefficients[row_index]
+            is_eligible = row < -self.pivot_tolerance
+            if not np.any(is_eligible):
+                return False
+            ratios = np.full(row.shape, float('inf'))
+            ratios[is_eligible] = self.reduced_costs[is_eligible] / -row[is_eligible]
+            self.pivot_row_index = row_index
+            self.pivot_column_index = np.argmin(ratios)
+            self.make_pivot_element_one()
+            self.make_pivot_independent()
+            self.swap_basis_variable()
+            self.calculate_reduced_costs()
+        return False
 
     def make_pivot_element_one(self):
         """Multiply the pivot row to make the pivot element equal 1."""
@@ -110,46 +228,135 @@ class Simplex:
     def swap_basis_variable(self):
         """Moves a new variable into the basis."""
         self.basis_objective[self.pivot_row_index][0] = self.objective[self.pivot_column_index]
-        variable = Variable()
-        if self.pivot_column_index >= self.basis_size:
-            variable.is_slack = True
-            variable.number = self.pivot_column_index - self.basis_size
-        else:
-            variable.is_slack = False
-            variable.number = self.pivot_column_index
-        self.basis_variables[self.pivot_row_index] = variable
+        leaving_column_index = self.basis_indices[self.pivot_row_index]
+        self.basis_positions[leaving_column_index] = -1
+        self.nonbasic_status[leaving_column_index] = NONBASIC_AT_LOWER
+        self.basis_indices[self.pivot_row_index] = self.pivot_column_index
+        self.basis_positions[self.pivot_column_index] = self.pivot_row_index
+        self.nonbasic_status[self.pivot_column_index] = BASIC
 
     def obtain_solution(self):
         """Extracts the solution given the basis variables and basis solution."""
-        self.solution = np.zeros((self.coefficients.shape[1] / 2, 1), dtype='float')
-        for index, variable in enumerate(self.basis_variables):
-            if not variable.is_slack:
-                self.solution[variable.number] = self.basis_solution[index]
-
-    def run(self):
-        """Run complete simplex."""
-        # Set up the tableau.
-        self.initialize_tableau()
+        self.solution = np.zeros((self.number_of_variables, 1), dtype='float')
+        is_original = self.basis_indices < self.number_of_variables
+        self.solution[self.basis_indices[is_original], 0] = self.basis_solution[is_original, 0]
+
+    def obtain_duals(self):
+        """Extracts the constraint duals, which are the reduced costs of the slack columns."""
+        slack_reduced_costs = self.reduced_costs[self.number_of_variables:self.number_of_variables + self.basis_size]
+        self.duals = slack_reduced_costs.reshape((-1, 1)).copy()
+
+    def obtain_ray(self):
+        """Extracts the direction of unboundedness in the original variables. Increasing the unbounded
+        column moves each basis variable against its column entry."""
+        column = self.coefficients[:, self.unbounded_column_index]
+        self.ray = np.zeros((self.number_of_variables, 1), dtype='float')
+        if self.unbounded_column_index < self.number_of_variables:
+            self.ray[self.unbounded_column_index] = 1
+        is_original = self.basis_indices < self.number_of_variables
+        self.ray[self.basis_indices[is_original], 0] = -column[is_original]
+
+    def obtain_basis_columns(self):
+        """Returns the tableau column index of the basis variable in each row."""
+        return self.basis_indices.copy()
+
+    def load_basis(self, basis_columns):
+        """Pivots the given columns into the basis to warm start from a known basis.
+        Leaves the slack basis in place and returns False if the basis is singular or infeasible."""
+        saved = (self.coefficients.copy(), self.basis_solution.copy(), self.basis_objective.copy(),
+                 self.basis_indices.copy())
+        free_rows = list(range(self.basis_size))
+        for column_index in basis_columns:
+            column = np.abs(self.coefficients[free_rows, column_index])
+            if column.size == 0 or column.max() < 1e-9:
+                break
+            self.pivot_row_index = free_rows.pop(int(np.argmax(column)))
+            self.pivot_column_index = column_index
+            self.make_pivot_element_one()
+            self.make_pivot_independent()
+            self.swap_basis_variable()
+        else:
+            if np.all(self.basis_solution >= -1e-9):
+                return True
+        self.coefficients, self.basis_solution, self.basis_objective, basis_indices = saved
+        self.set_basis(basis_indices)
+        return False
+
+    def step(self, phase):
+        """Creates the light state reported for the current point in the solve."""
+        return Step(phase=phase,
+                    iteration=self.iteration,
+                    pivot_column_index=self.pivot_column_index,
+                    pivot_row_index=self.pivot_row_index,
+                    leaving_column_index=self.leaving_column_index,
+                    value=float('inf') if phase == 'unbounded' else self.basis_value)
+
+    def steps(self, basis_columns=None, max_iterations=None, time_limit=None, cancellation=None,
+              initialize=True):
+        """Run simplex as a generator, yielding a step at each phase of each iteration.
+        Stops early when the iteration or time limit is reached or the cancellation token (any
+        object with an `is_set` method, such as a `threading.Event`) is set."""
+        start_time = time.monotonic()
+        if initialize:
+            # Set up the tableau.
+            self.initialize_tableau()
+        if basis_columns is not None:
+            self.is_warm_started = self.load_basis(basis_columns)
+        self.iteration = 0
+        self.degenerate_pivots = 0
+        self.status = 'running'
         while True:
             # Calculate the value and reduced costs.
             self.calculate_basis_value()
             self.calculate_reduced_costs()
+            yield self.step('reduced_costs')
             # End if the solution is optimal or unbounded.
             if self.check_if_optimal():
-                self.value = self.basis_value
-                self.obtain_solution()
-                return
-            if self.check_if_unbounded():
+                if self.is_perturbed:
+                    self.remove_perturbation()
+                    if not self.restore_feasibility():
+                        self.is_optimal = False
+                        self.status = 'numerical_error'
+                if self.is_optimal:
+                    self.value = self.basis_value
+                    self.obtain_solution()
+                    self.obtain_duals()
+                    self.status = 'optimal'
+            elif self.check_if_unbounded():
                 self.value = float('inf')
+                self.obtain_ray()
+                self.status = 'unbounded'
+            # End if a limit has been reached.
+            elif max_iterations is not None and self.iteration >= max_iterations:
+                self.status = 'iteration_limit'
+            elif time_limit is not None and time.monotonic() - start_time >= time_limit:
+                self.status = 'time_limit'
+            elif cancellation is not None and cancellation.is_set():
+                self.status = 'cancelled'
+            if self.status != 'running':
+                # The perturbation never outlives the solve, whichever way it ends.
+                if self.is_perturbed:
+                    self.remove_perturbation()
+                yield self.step(self.status)
                 return
             # Determine the pivot.
             self.obtain_pivot_column_index()
             self.obtain_pivot_row_index()
+            self.leaving_column_index = self.basis_indices[self.pivot_row_index]
+            yield self.step('pivot_selected')
             # Perform pivot.
             self.make_pivot_element_one()
             self.make_pivot_independent()
+            yield self.step('pivoted')
             self.swap_basis_variable()
+            self.iteration += 1
+            self.calculate_basis_value()
+            yield self.step('swapped')
 
-
-
-
+    def run(self, basis_columns=None, max_iterations=None, time_limit=None, cancellation=None):
+        """Run complete simplex. Optionally warm start from the given basis columns.
+        Returns the final status."""
+        for _ in self.steps(basis_columns=basis_columns, max_iterations=max_iterations,
+                            time_limit=time_limit, cancellation=cancellation):
+            pass
+        return self.status
@@ -0,0 +1,100 @@
+"""Tests for the solution cache module."""
+import numpy as np
+import pytest
+from cache import CacheEntry, SolutionCache
+
+
+def example_problem(constraints=(4, 2)):
+    coefficients = np.array([[1,  1],
+                             [1, -1]], dtype='float')
+    objective = np.array([3, 2], dtype='float')
+    return coefficients, np.array(constraints, dtype='float').reshape((-1, 1)), objective
+
+
+class TestSolutionCache:
+    """Tests for the solution cache class."""
+    def test_repeated_problem_is_a_hit(self):
+        cache = SolutionCache()
+
+        first = cache.run(*example_problem())
+        second = cache.run(*example_problem())
+
+        assert first is second
+        assert second.is_optimal
+        assert second.value == 11
+        assert np.array_equal(second.solution, np.array([[3], [1]]))
+        assert cache.statistics['hits'] == 1
+        assert cache.statistics['misses'] == 1
+
+    def test_integer_and_float_inputs_share_a_key(self):
+        cache = SolutionCache()
+        coefficients, constraints, objective = example_problem()
+
+        cache.run(coefficients.astype('int'), [4, 2], [3, 2])
+        entry = cache.run(coefficients, constraints, objective)
+
+        assert cache.statistics['hits'] == 1
+        assert entry.value == 11
+
+    def test_cached_arrays_are_read_only(self):
+        cache = SolutionCache()
+
+        entry = cache.run(*example_problem())
+
+        with pytest.raises(ValueError):
+            entry.solution[0] = 0
+        with pytest.raises(ValueError):
+            entry.basis[0] = 0
+
+    def test_negative_constraints_raise_and_are_not_stored(self, tmp_path):
+        cache = SolutionCache(directory=str(tmp_path))
+
+        with pytest.raises(ValueError):
+            cache.run(*example_problem(constraints=(-1, 2)))
+
+        assert cache.statistics['entries'] == 0
+        assert list(tmp_path.iterdir()) == []
+
+    def test_unbounded_result_is_cached(self):
+        cache = SolutionCache()
+        coefficients = np.array([[1, -1],
+                                 [2, -1]], dtype='float')
+        constraints = np.array([[10], [40]], dtype='float')
+        objective = np.array([2, 1], dtype='float')
+
+        cache.run(coefficients, constraints, objective)
+        entry = cache.run(coefficients, constraints, objective)
+
+        assert entry.is_unbounded
+
+    def test_least_recently_used_entries_are_evicted_by_bytes(self):
+        entry = CacheEntry(solution=np.zeros((2, 1)), basis=np.zeros(2, dtype='int'))
+        cache = SolutionCache(max_bytes=2 * entry.nbytes)
+
+        cache.remember('a', entry)
+        cache.remember('b', CacheEntry(solution=np.zeros((2, 1)), basis=np.zeros(2, dtype='int')))
+        cache.get('a')
+        cache.remember('c', CacheEntry(solution=np.zeros((2, 1)), basis=np.zeros(2, dtype='int')))
+
+        assert list(cache.entries) == ['a', 'c']
+        assert cache.bytes == 2 * entry.nbytes
+
+    def test_near_miss_warm_starts_from_the_stored_basis(self):
+        cache = SolutionCache()
+
+        cache.run(*example_problem())
+        entry = cache.run(*example_problem(constraints=(6, 2)))
+
+        assert cache.statistics['warm_starts'] == 1
+        assert entry.value == 16
+        assert np.array_equal(entry.solution, np.array([[4], [2]]))
+
+    def test_entries_persist_on_disk(self, tmp_path):
+        SolutionCache(directory=str(tmp_path)).run(*example_problem())
+        cache = SolutionCache(directory=str(tmp_path))
+
+        entry = cache.run(*example_problem())
+
+        assert cache.statistics['hits'] == 1
+        assert entry.value == 11
+        assert np.array_equal(entry.solution, np.array([[3], [1]]))
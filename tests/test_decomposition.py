@@ -0,0 +1,111 @@
+"""Tests for the decomposition module."""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from decomposition import DantzigWolfe, detect_blocks, price_block
+from simplex import Simplex
+
+
+def block_angular_problem():
+    coefficients = np.array([[1, 1, 1, 1],
+                             [1, 2, 0, 0],
+                             [3, 1, 0, 0],
+                             [0, 0, 1, 1],
+                             [0, 0, 2, 1]], dtype='float')
+    constraints = np.array([[5], [8], [9], [4], [6]], dtype='float')
+    objective = np.array([2, 3, 1, 2], dtype='float')
+    return coefficients, constraints, objective
+
+
+def failing_run(simplex, **kwargs):
+    simplex.status = 'numerical_error'
+    return simplex.status
+
+
+class TestDantzigWolfe:
+    """Tests for the Dantzig-Wolfe decomposition class."""
+    def test_detecting_blocks(self):
+        coefficients, _, _ = block_angular_problem()
+
+        blocks = detect_blocks(coefficients, linking_rows=[0])
+
+        assert [block.rows.tolist() for block in blocks] == [[1, 2], [3, 4]]
+        assert [block.columns.tolist() for block in blocks] == [[0, 1], [2, 3]]
+
+    def test_variables_only_in_linking_rows_form_their_own_block(self):
+        coefficients = np.array([[1, 1, 1],
+                                 [1, 2, 0]], dtype='float')
+
+        blocks = detect_blocks(coefficients, linking_rows=[0])
+
+        assert [block.columns.tolist() for block in blocks] == [[0, 1], [2]]
+        assert blocks[1].rows.tolist() == []
+
+    def test_rows_are_assigned_to_the_block_of_their_columns(self):
+        coefficients = np.array([[1, 1, 1, 1],
+                                 [0, 0, 1, 0],
+                                 [0, 0, 0, 0],
+                                 [1, 0, 0, 1],
+                                 [0, 1, 0, 0]], dtype='float')
+
+        blocks = detect_blocks(coefficients, linking_rows=[0])
+
+        assert [block.rows.tolist() for block in blocks] == [[3], [4], [1]]
+        assert [block.columns.tolist() for block in blocks] == [[0, 3], [1], [2]]
+
+    def test_decomposition_matches_the_monolithic_simplex(self):
+        coefficients, constraints, objective = block_angular_problem()
+        simplex = Simplex(coefficients=coefficients, constraints=constraints, objective=objective)
+        simplex.run()
+        decomposition = DantzigWolfe(coefficients=coefficients, constraints=constraints, objective=objective,
+                                     linking_rows=[0])
+
+        decomposition.run()
+
+        assert decomposition.is_optimal
+        assert abs(decomposition.value - simplex.value) < 1e-9
+        assert np.all(coefficients.dot(decomposition.solution) <= constraints + 1e-9)
+        assert abs(objective.dot(decomposition.solution.flatten()) - simplex.value) < 1e-9
+
+    def test_decomposition_detects_unboundedness(self):
+        coefficients = np.array([[1, -1, 1],
+                                 [1,  0, 0],
+                                 [0,  0, 1]], dtype='float')
+        constraints = np.array([[4], [3], [2]], dtype='float')
+        objective = np.array([1, 1, 1], dtype='float')
+        decomposition = DantzigWolfe(coefficients=coefficients, constraints=constraints, objective=objective,
+                                     linking_rows=[0])
+
+        decomposition.run()
+
+        assert decomposition.is_unbounded
+
+    def test_failed_subproblem_stops_with_its_status(self, monkeypatch):
+        coefficients, constraints, objective = block_angular_problem()
+        decomposition = DantzigWolfe(coefficients=coefficients, constraints=constraints, objective=objective,
+                                     linking_rows=[0])
+        monkeypatch.setattr(Simplex, 'run', failing_run)
+
+        assert price_block(coefficients[1:3, :2], constraints[1:3], objective[:2]) == ('numerical_error', None, None)
+        assert decomposition.run() == 'numerical_error'
+        assert not decomposition.is_optimal
+
+    def test_failed_master_stops_with_its_status(self, monkeypatch):
+        coefficients, constraints, objective = block_angular_problem()
+        decomposition = DantzigWolfe(coefficients=coefficients, constraints=constraints, objective=objective,
+                                     linking_rows=[0])
+        monkeypatch.setattr(decomposition, 'solve_master', lambda basis_columns: 'numerical_error')
+
+        assert decomposition.run() == 'numerical_error'
+        assert not decomposition.is_optimal
+
+    def test_subproblems_can_be_solved_in_separate_processes(self):
+        coefficients, constraints, objective = block_angular_problem()
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=2, mp_context=context) as executor:
+            decomposition = DantzigWolfe(coefficients=coefficients, constraints=constraints, objective=objective,
+                                         linking_rows=[0], executor=executor)
+            decomposition.run()
+
+        assert decomposition.is_optimal
+        assert abs(decomposition.value - 14) < 1e-9
@@ -1,4 +1,5 @@
 """Functional tests for the simplex module."""
+import threading
 import numpy as np
 from simplex import Simplex
 
@@ -33,4 +34,127 @@ class TestFunctionalSimplex:
 
         assert simplex.is_optimal
         assert simplex.value == 28
-        assert np.array_equal(simplex.solution, np.array([[0], [4]]))
\ No newline at end of file
+        assert np.array_equal(simplex.solution, np.array([[0], [4]]))
+
+    def test_steps_yield_each_phase_until_optimal(self):
+        coefficients = np.array([[1,  1],
+                                 [1, -1]])
+        constraints = np.array([[4],
+                                [2]])
+        objective = np.array([3, 2])
+        simplex = Simplex(coefficients=coefficients, constraints=constraints, objective=objective)
+
+        steps = list(simplex.steps())
+
+        assert [step.phase for step in steps[:4]] == ['reduced_costs', 'pivot_selected', 'pivoted', 'swapped']
+        assert steps[0].iteration == 0 and steps[3].iteration == 1
+        assert steps[1].pivot_column_index == 0 and steps[1].pivot_row_index == 1
+        assert steps[1].leaving_column_index == 3 and steps[3].leaving_column_index == 3
+        assert steps[-1].phase == 'optimal'
+        assert steps[-1].value == 11
+        assert simplex.status == 'optimal'
+
+    def test_unbounded_step_reports_an_infinite_value(self):
+        coefficients = np.array([[1, -1],
+                                 [2, -1]])
+        constraints = np.array([[10],
+                                [40]])
+        objective = np.array([2, 1])
+        simplex = Simplex(coefficients=coefficients, constraints=constraints, objective=objective)
+
+        steps = list(simplex.steps())
+
+        assert steps[-1].phase == 'unbounded'
+        assert steps[-1].value == float('inf')
+
+    def test_steps_load_the_basis_on_an_initialized_tableau(self):
+        coefficients = np.array([[1,  1],
+                                 [1, -1]])
+        constraints = np.array([[4],
+                                [2]])
+        objective = np.array([3, 2])
+        simplex = Simplex(coefficients=coefficients, constraints=constraints, objective=objective)
+        simplex.initialize_tableau()
+
+        steps = list(simplex.steps(basis_columns=[0, 1], initialize=False))
+
+        assert simplex.is_warm_started
+        assert [step.phase for step in steps] == ['reduced_costs', 'optimal']
+        assert simplex.value == 11
+
+    def test_iteration_limit_stops_the_solve(self):
+        coefficients = np.array([[1,  1],
+                                 [1, -1]])
+        constraints = np.array([[4],
+                                [2]])
+        objective = np.array([3, 2])
+        simplex = Simplex(coefficients=coefficients, constraints=constraints, objective=objective)
+
+        status = simplex.run(max_iterations=1)
+
+        assert status == 'iteration_limit'
+        assert simplex.iteration == 1
+        assert not simplex.is_optimal
+
+    def test_time_limit_and_cancellation_stop_the_solve(self):
+        coefficients = np.array([[1,  1],
+                                 [1, -1]])
+        constraints = np.array([[4],
+                                [2]])
+        objective = np.array([3, 2])
+        cancellation = threading.Event()
+        cancellation.set()
+
+        timed = Simplex(coefficients=coefficients, constraints=constraints, objective=objective)
+        cancelled = Simplex(coefficients=coefficients, constraints=constraints, objective=objective)
+
+        assert timed.run(time_limit=0) == 'time_limit'
+        assert cancelled.run(cancellation=cancellation) == 'cancelled'
+
+    def test_perturbed_degenerate_simplex_removes_the_perturbation(self):
+        coefficients = np.array([[0.25,  -8,   -1, 9],
+                                 [0.5,  -12, -0.5, 3],
+                                 [0,      0,    1, 0]])
+        constraints = np.array([[0],
+                                [0],
+                                [1]])
+        objective = np.array([0.75, -20, 0.5, -6])
+        simplex = Simplex(coefficients=coefficients, constraints=constraints, objective=objective)
+        simplex.degenerate_pivot_limit = 1
+
+        simplex.run()
+
+        assert simplex.is_optimal
+        assert not simplex.is_perturbed
+        assert simplex.value == 1.25
+        assert np.array_equal(simplex.solution, np.array([[1], [0], [1], [0]]))
+
+    def test_perturbation_is_removed_when_a_limit_stops_the_solve(self):
+        coefficients = np.array([[0.25,  -8,   -1, 9],
+                                 [0.5,  -12, -0.5, 3],
+                                 [0,      0,    1, 0]])
+        constraints = np.array([[0],
+                                [0],
+                                [1]])
+        objective = np.array([0.75, -20, 0.5, -6])
+        simplex = Simplex(coefficients=coefficients, constraints=constraints, objective=objective)
+        simplex.degenerate_pivot_limit = 1
+
+        status = simplex.run(max_iterations=1)
+
+        basis_inverse = simplex.coefficients[:, 4:]
+        assert status == 'iteration_limit'
+        assert not simplex.is_perturbed
+        assert np.array_equal(simplex.basis_solution, basis_inverse.dot(constraints))
+
+    def test_optimal_simplex_provides_duals(self):
+        coefficients = np.array([[1,  1],
+                                 [1, -1]])
+        constraints = np.array([[4],
+                                [2]])
+        objective = np.array([3, 2])
+        simplex = Simplex(coefficients=coefficients, constraints=constraints, objective=objective)
+
+        simplex.run()
+
+        assert np.array_equal(simplex.duals, np.array([[2.5], [0.5]]))
@@ -0,0 +1,88 @@
+"""Tests for the model module."""
+import numpy as np
+import pytest
+from model import GrowableArray, Model
+
+
+class TestGrowableArray:
+    """Tests for the growable array class."""
+    def test_extending_grows_the_buffer(self):
+        array = GrowableArray(dtype='int64', capacity=2)
+
+        array.extend([1, 2, 3])
+        array.extend(np.array([4, 5]))
+
+        assert len(array) == 5
+        assert array.values.dtype == np.int64
+        assert np.array_equal(array.values, np.array([1, 2, 3, 4, 5]))
+
+
+class TestModel:
+    """Tests for the model class."""
+    def test_building_a_model_produces_the_dense_problem(self):
+        model = Model()
+        variables = model.add_variables(2, objective=[3, 2])
+        model.add_constraints([4, 2], rows=[0, 0, 1, 1], columns=[variables[0], variables[1]] * 2,
+                              values=[1, 1, 1, -1])
+
+        coefficients, constraints, objective = model.to_arrays()
+
+        assert np.array_equal(coefficients, np.array([[1, 1], [1, -1]]))
+        assert np.array_equal(constraints, np.array([[4], [2]]))
+        assert np.array_equal(objective, np.array([3, 2]))
+
+    def test_rows_are_relative_to_each_call_and_repeats_are_summed(self):
+        model = Model()
+        model.add_variables(2)
+        model.set_objective([1], [5])
+        model.add_constraints([1], rows=[0], columns=[0], values=[1])
+        rows = model.add_constraints([2, 3], rows=[1, 1], columns=[1, 1], values=[2, 0.5])
+
+        coefficients, _, objective = model.to_arrays()
+
+        assert np.array_equal(rows, np.array([1, 2]))
+        assert np.array_equal(coefficients, np.array([[1, 0], [0, 0], [0, 2.5]]))
+        assert np.array_equal(objective, np.array([0, 5]))
+
+    def test_variables_can_be_added_with_coefficients_in_existing_constraints(self):
+        model = Model()
+        model.add_variables(1, objective=3)
+        model.add_constraints([4, 2], rows=[0, 1], columns=[0, 0], values=[1, 1])
+
+        variables = model.add_variables(1, objective=2, rows=[0, 1], columns=[0, 0], values=[1, -1])
+        coefficients, _, objective = model.to_arrays()
+
+        assert np.array_equal(variables, np.array([1]))
+        assert np.array_equal(coefficients, np.array([[1, 1], [1, -1]]))
+        assert np.array_equal(objective, np.array([3, 2]))
+
+    def test_adding_variables_with_coefficients_in_unknown_constraints_raises(self):
+        model = Model()
+
+        with pytest.raises(ValueError):
+            model.add_variables(1, rows=[0], columns=[0], values=[1])
+
+    def test_negative_upper_bounds_raise(self):
+        model = Model()
+        model.add_variables(1)
+
+        with pytest.raises(ValueError):
+            model.add_constraints([-1], rows=[0], columns=[0], values=[1])
+
+    def test_adding_coefficients_for_unknown_variables_raises(self):
+        model = Model()
+        model.add_variables(1)
+
+        with pytest.raises(ValueError):
+            model.add_constraints([1], rows=[0], columns=[1], values=[1])
+
+    def test_model_solves_with_simplex(self):
+        model = Model()
+        model.add_variables(2, objective=[3, 2])
+        model.add_constraints([4, 2], rows=[0, 0, 1, 1], columns=[0, 1, 0, 1], values=[1, 1, 1, -1])
+        simplex = model.to_simplex()
+
+        simplex.run()
+
+        assert simplex.value == 11
+        assert np.array_equal(simplex.solution, np.array([[3], [1]]))
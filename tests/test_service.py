@@ -0,0 +1,155 @@
+"""Tests for the solve service module."""
+import asyncio
+import base64
+import json
+import numpy as np
+import pytest
+from service import SolveJob, SolveService, decode_array, decode_problem, solve_batch
+
+
+def encode_array(array):
+    return {'dtype': 'float64', 'shape': list(array.shape), 'data': base64.b64encode(array.tobytes()).decode()}
+
+
+async def group_shapes(service, shapes):
+    """Groups jobs of the given coefficient shapes and returns the shapes of each batch."""
+    jobs = [SolveJob(index, (np.zeros(shape), None, None), None) for index, shape in enumerate(shapes)]
+    return [[job.shape for job in batch] for batch in service.group_jobs(jobs)]
+
+
+async def send_requests(service, requests):
+    """Sends requests to a running service and collects every message sent back."""
+    server = await service.start(port=0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    for request in requests:
+        if isinstance(request, bytes):
+            # Raw bytes are sent on their own, so a message can be split over several reads.
+            writer.write(request)
+            await writer.drain()
+            await asyncio.sleep(0.01)
+        else:
+            writer.write(json.dumps(request).encode() + b'\n')
+    await writer.drain()
+    writer.write_eof()
+    messages = []
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        messages.append(json.loads(line))
+    writer.close()
+    await service.stop()
+    return messages
+
+
+async def abort_a_batch_mate(service, request):
+    """Sends the same request from two clients, aborts the first and collects the messages of the second."""
+    server = await service.start(port=0)
+    port = server.sockets[0].getsockname()[1]
+    aborted_reader, aborted_writer = await asyncio.open_connection('127.0.0.1', port)
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    aborted_writer.write(json.dumps(dict(request, id='aborted')).encode() + b'\n')
+    writer.write(json.dumps(request).encode() + b'\n')
+    await asyncio.gather(aborted_writer.drain(), writer.drain())
+    await aborted_reader.readline()
+    aborted_writer.transport.abort()
+    writer.write_eof()
+    messages = []
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        messages.append(json.loads(line))
+    writer.close()
+    await service.stop()
+    return messages
+
+
+class TestService:
+    """Tests for the solve service."""
+    def test_decoding_binary_arrays(self):
+        array = np.array([[1, 1], [1, -1]], dtype='float64')
+
+        assert np.array_equal(decode_array(encode_array(array)), array)
+
+    def test_decoding_problem_with_mismatched_shapes_raises(self):
+        with pytest.raises(ValueError):
+            decode_problem({'coefficients': [[1, 1], [1, -1]], 'constraints': [4, 2], 'objective': [3]})
+
+    def test_decoding_problem_with_negative_constraints_raises(self):
+        with pytest.raises(ValueError):
+            decode_problem({'coefficients': [[1, 1]], 'constraints': [-1], 'objective': [1, 1]})
+
+    def test_solve_batch_returns_a_result_per_problem(self):
+        problem = (np.array([[1, 1], [1, -1]], dtype='float'),
+                   np.array([[4], [2]], dtype='float'),
+                   np.array([3, 2], dtype='float'))
+        unbounded = (np.array([[1, -1], [2, -1]], dtype='float'),
+                     np.array([[10], [40]], dtype='float'),
+                     np.array([2, 1], dtype='float'))
+
+        results = solve_batch([problem, unbounded])
+
+        assert results[0]['status'] == 'optimal'
+        assert results[0]['value'] == 11
+        assert results[0]['solution'] == [3, 1]
+        assert results[1]['status'] == 'unbounded'
+
+    def test_solve_batch_reports_negative_constraints_as_errors(self):
+        results = solve_batch([(np.array([[1, 1]], dtype='float'), np.array([[-1]], dtype='float'),
+                                np.array([1, 1], dtype='float'))])
+
+        assert results == [{'status': 'error', 'error': 'constraints must be non-negative'}]
+
+    def test_service_streams_status_and_results(self):
+        requests = [{'id': index, 'coefficients': [[1, 1], [1, -1]], 'constraints': [4, 2], 'objective': [3, 2]}
+                    for index in range(3)]
+        requests.append({'id': 'bad', 'coefficients': [[1]], 'constraints': [1, 2], 'objective': [1]})
+
+        messages = asyncio.run(send_requests(SolveService(workers=1), requests))
+
+        for index in range(3):
+            statuses = [message['status'] for message in messages if message['id'] == index]
+            assert statuses == ['queued', 'running', 'optimal']
+        results = [message for message in messages if message['status'] == 'optimal']
+        assert all(result['value'] == 11 for result in results)
+        assert [message['status'] for message in messages if message['id'] == 'bad'] == ['error']
+
+    def test_aborted_client_does_not_stop_its_batch_mates(self):
+        request = {'id': 0, 'coefficients': [[1, 1], [1, -1]], 'constraints': [4, 2], 'objective': [3, 2]}
+
+        messages = asyncio.run(abort_a_batch_mate(SolveService(workers=1, batch_window=0.2), request))
+
+        assert [message['status'] for message in messages] == ['queued', 'running', 'optimal']
+
+    def test_interleaved_shapes_are_each_batched(self):
+        service = SolveService(small_problem_size=10, max_batch_size=2)
+
+        batches = asyncio.run(group_shapes(service, [(2, 2), (3, 2), (2, 2), (3, 2), (2, 2), (4, 4)]))
+
+        assert sorted(batches) == sorted([[(4, 4)], [(2, 2), (2, 2)], [(2, 2)], [(3, 2), (3, 2)]])
+
+    def test_large_binary_problems_and_malformed_lines_get_replies(self):
+        coefficients = np.identity(100)
+        request = {'id': 'large', 'coefficients': encode_array(coefficients),
+                   'constraints': encode_array(np.ones(100)), 'objective': encode_array(np.ones(100))}
+        requests = [b'[1, 2]\n', request]
+
+        messages = asyncio.run(send_requests(SolveService(workers=1), requests))
+
+        assert messages[0] == {'id': None, 'status': 'error', 'error': 'message must be a JSON object'}
+        assert [message['status'] for message in messages if message['id'] == 'large'] == ['queued', 'running',
+                                                                                              'optimal']
+        assert messages[-1]['value'] == 100
+
+    def test_oversized_messages_get_an_error(self):
+        request = {'id': 0, 'coefficients': [[1, 1], [1, -1]], 'constraints': [4, 2], 'objective': [3, 2]}
+        oversized = json.dumps(dict(request, id='oversized', padding='x' * 5000)).encode() + b'\n'
+        chunks = [oversized[start:start + 700] for start in range(0, len(oversized), 700)]
+
+        messages = asyncio.run(send_requests(SolveService(workers=1, max_message_size=1024), chunks + [request]))
+
+        assert [message['status'] for message in messages if message['id'] is None] == ['error']
+        assert messages[0]['error'] == 'message longer than 1024 bytes'
+        assert [message['status'] for message in messages if message['id'] == 0] == ['queued', 'running', 'optimal']
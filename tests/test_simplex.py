@@ -1,5 +1,6 @@
 """Tests for the simplex module."""
 import numpy as np
+import pytest
 from simplex import Simplex
 from variable import Variable
 
@@ -85,6 +86,17 @@ class TestSimplex:
 
         assert Variable(index=2, is_slack=True) in simplex.basis_variables
 
+    def test_initializing_basis_sets_the_slack_columns_as_basis_indices(self):
+        simplex = Simplex(coefficients=np.array([[1,  1],
+                                                 [1, -1]], dtype='float'),
+                          constraints=np.array([[4], [2]], dtype='float'))
+
+        simplex.initialize_tableau()
+
+        assert np.array_equal(simplex.basis_indices, np.array([2, 3]))
+        assert np.array_equal(simplex.basis_positions, np.array([-1, -1, 0, 1]))
+        assert np.array_equal(simplex.nonbasic_status, np.array([1, 1, 0, 0]))
+
     def test_calculation_of_basis_value(self):
         simplex = Simplex()
         simplex.basis_objective = np.array([[1],
@@ -170,15 +182,62 @@ class TestSimplex:
     def test_pivot_row_attaining(self):
         simplex = Simplex()
         simplex.pivot_column_index = 1
-        simplex.coefficients = np.array([[1, 2, -1],
-                                         [2, 1,  1],
-                                         [2, 1,  1]])
-        simplex.basis_solution = np.array([[-5], [1], [2]])
+        simplex.coefficients = np.array([[1, -2, -1],
+                                         [2,  1,  1],
+                                         [2,  1,  1]])
+        simplex.basis_solution = np.array([[5], [1], [2]])
 
         simplex.obtain_pivot_row_index()
 
         assert simplex.pivot_row_index == 1
 
+    def test_pivot_row_ignores_tiny_pivot_elements(self):
+        simplex = Simplex()
+        simplex.pivot_column_index = 0
+        simplex.coefficients = np.array([[1e-12, 1],
+                                         [2,     1]])
+        simplex.basis_solution = np.array([[1e-15], [4]])
+
+        simplex.obtain_pivot_row_index()
+
+        assert simplex.pivot_row_index == 1
+
+    def test_pivot_row_prefers_the_largest_pivot_among_near_ties(self):
+        simplex = Simplex()
+        simplex.pivot_column_index = 0
+        simplex.coefficients = np.array([[1, 1],
+                                         [4, 1]])
+        simplex.basis_solution = np.array([[1], [4 + 1e-10]])
+
+        simplex.obtain_pivot_row_index()
+
+        assert simplex.pivot_row_index == 1
+
+    def test_repeated_degenerate_pivots_turn_on_perturbation(self):
+        simplex = Simplex()
+        simplex.degenerate_pivot_limit = 2
+        simplex.pivot_column_index = 0
+        simplex.coefficients = np.array([[1, 1],
+                                         [1, 1]], dtype='float')
+        simplex.basis_solution = np.array([[0], [1]], dtype='float')
+
+        simplex.obtain_pivot_row_index()
+        assert not simplex.is_perturbed
+        simplex.obtain_pivot_row_index()
+
+        assert simplex.is_perturbed
+        assert np.all(simplex.basis_solution > np.array([[0], [1]]))
+        assert simplex.pivot_row_index == np.argmin(simplex.basis_solution)
+
+    def test_restoring_feasibility_fails_without_an_entering_column(self):
+        simplex = Simplex()
+        simplex.basis_size = 1
+        simplex.coefficients = np.array([[1, 1, 1]], dtype='float')
+        simplex.basis_solution = np.array([[-1]], dtype='float')
+        simplex.reduced_costs = np.array([1, 1, 0], dtype='float')
+
+        assert not simplex.restore_feasibility()
+
     def test_making_pivot_element_one_multiplies_the_coefficient_row(self):
         simplex = Simplex()
         simplex.pivot_column_index = 2
@@ -263,6 +322,7 @@ class TestSimplex:
     def test_swap_basis_variables(self):
         simplex = Simplex()
         simplex.basis_size = 2
+        simplex.number_of_variables = 2
         simplex.basis_variables = [Variable(index=0, is_slack=True), Variable(index=1, is_slack=True)]
         simplex.objective = np.array([3, 2, 0, 0], dtype='float')
         simplex.basis_objective = np.array([[0],
@@ -277,6 +337,9 @@ class TestSimplex:
         expected_basis_variables = [Variable(index=0, is_slack=True), Variable(index=0, is_slack=False)]
         assert np.array_equal(simplex.basis_objective, expected_basis_objective)
         assert simplex.basis_variables == expected_basis_variables
+        assert np.array_equal(simplex.basis_indices, np.array([2, 0]))
+        assert np.array_equal(simplex.basis_positions, np.array([1, -1, 0, -1]))
+        assert np.array_equal(simplex.nonbasic_status, np.array([0, 1, 0, 1]))
 
     def test_can_initialize_on_creation(self):
         coefficients = np.array([[5]], dtype='float')
@@ -289,13 +352,44 @@ class TestSimplex:
         assert np.array_equal(simplex.constraints, constraints)
         assert np.array_equal(simplex.objective, objective)
 
+    def test_assigning_basis_variables_before_the_variables_are_known_raises(self):
+        simplex = Simplex()
+
+        with pytest.raises(ValueError):
+            simplex.basis_variables = [Variable(index=0, is_slack=True), Variable(index=0, is_slack=False)]
+
     def test_extract_solution(self):
         simplex = Simplex()
         simplex.coefficients = np.array([[1,  1, 1, 0],
                                          [1, -1, 0, 1]], dtype='float')
+        simplex.number_of_variables = 2
         simplex.basis_variables = [Variable(index=0, is_slack=True), Variable(index=1, is_slack=False)]
         simplex.basis_solution = np.array([[9], [4]], dtype='float')
 
         simplex.obtain_solution()
 
-        assert np.array_equal(simplex.solution, np.array([[0], [4]], dtype='float'))
\ No newline at end of file
+        assert np.array_equal(simplex.solution, np.array([[0], [4]], dtype='float'))
+
+    def test_loading_a_basis_pivots_the_columns_in(self):
+        simplex = Simplex(coefficients=np.array([[1,  1],
+                                                 [1, -1]], dtype='float'),
+                          constraints=np.array([[4], [2]], dtype='float'),
+                          objective=np.array([3, 2], dtype='float'))
+        simplex.initialize_tableau()
+
+        assert simplex.load_basis([1, 0])
+
+        assert np.array_equal(simplex.basis_solution, np.array([[1], [3]], dtype='float'))
+        assert simplex.basis_variables == [Variable(index=1, is_slack=False), Variable(index=0, is_slack=False)]
+
+    def test_loading_an_infeasible_basis_keeps_the_slack_basis(self):
+        simplex = Simplex(coefficients=np.array([[1,  1],
+                                                 [1, -1]], dtype='float'),
+                          constraints=np.array([[4], [6]], dtype='float'),
+                          objective=np.array([3, 2], dtype='float'))
+        simplex.initialize_tableau()
+
+        assert not simplex.load_basis([0, 1])
+
+        assert np.array_equal(simplex.basis_solution, np.array([[4], [6]], dtype='float'))
+        assert simplex.basis_variables == [Variable(index=0, is_slack=True), Variable(index=1, is_slack=True)]
@@ -0,0 +1,64 @@
+"""Tests for the validation module."""
+import numpy as np
+from simplex import Simplex
+from validation import check_optimal_batch, check_results, check_unbounded_batch
+
+
+def example_problem():
+    coefficients = np.array([[1,  1],
+                             [1, -1]], dtype='float')
+    constraints = np.array([[4], [2]], dtype='float')
+    objective = np.array([3, 2], dtype='float')
+    return coefficients, constraints, objective
+
+
+class TestValidation:
+    """Tests for the certificate checks."""
+    def test_optimal_certificate_is_valid(self):
+        coefficients, constraints, objective = example_problem()
+
+        report = check_optimal_batch(coefficients[None], constraints.T, objective[None],
+                                     solutions=[[3, 1]], duals=[[2.5, 0.5]], values=[11])
+
+        assert report.valid.tolist() == [True]
+
+    def test_each_broken_condition_is_reported(self):
+        coefficients, constraints, objective = example_problem()
+        stacked = (np.stack([coefficients] * 4), np.stack([constraints.ravel()] * 4), np.stack([objective] * 4))
+
+        report = check_optimal_batch(*stacked,
+                                     solutions=[[3, 1], [4, 1], [3, 1], [2, 0]],
+                                     duals=[[2.5, 0.5], [2.5, 0.5], [1, 0.5], [3, 0]],
+                                     values=[11, 11, 11, 6])
+
+        assert report.valid.tolist() == [True, False, False, False]
+        assert report.primal_feasible.tolist() == [True, False, True, True]
+        assert report.dual_feasible.tolist() == [True, True, False, True]
+        assert report.complementary.tolist() == [True, False, False, False]
+        assert report.objective_matches.tolist() == [True, False, False, False]
+
+    def test_unbounded_ray_is_checked(self):
+        coefficients = np.array([[1, -1],
+                                 [2, -1]], dtype='float')
+        constraints = np.array([10, 40], dtype='float')
+        objective = np.array([2, 1], dtype='float')
+
+        report = check_unbounded_batch(np.stack([coefficients] * 2), np.stack([constraints] * 2),
+                                       np.stack([objective] * 2), rays=[[0, 1], [1, 0]])
+
+        assert report.valid.tolist() == [True, False]
+
+    def test_checking_simplex_results_of_mixed_shapes(self):
+        problems = [example_problem(),
+                    (np.array([[1, 1], [3, -8], [10, 7]], dtype='float'), np.array([[4], [24], [35]], dtype='float'),
+                     np.array([5, 7], dtype='float')),
+                    (np.array([[1, -1], [2, -1]], dtype='float'), np.array([[10], [40]], dtype='float'),
+                     np.array([2, 1], dtype='float'))]
+        simplexes = []
+        for coefficients, constraints, objective in problems:
+            simplex = Simplex(coefficients=coefficients, constraints=constraints, objective=objective)
+            simplex.run()
+            simplexes.append(simplex)
+        simplexes[0].value = 12
+
+        assert check_results(problems, simplexes).tolist() == [False, True, True]
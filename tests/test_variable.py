@@ -14,4 +14,10 @@ class TestVariable:
 
         assert variable0 == variable1
         assert not variable0 == variable2
-        assert not variable0 == variable3
\ No newline at end of file
+        assert not variable0 == variable3
+
+    def test_variable_columns(self):
+        """Test that variables convert to and from tableau column indices."""
+        assert Variable.from_column(1, number_of_variables=2) == Variable(index=1, is_slack=False)
+        assert Variable.from_column(3, number_of_variables=2) == Variable(index=1, is_slack=True)
+        assert Variable(index=1, is_slack=True).column(number_of_variables=2) == 3
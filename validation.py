@@ -0,0 +1,82 @@
+"""
+Vectorized checks of simplex optimality and unboundedness certificates.
+For the problem of maximizing c x subject to A x <= b and x >= 0, an optimal solution x with duals y is
+certified by primal feasibility, dual feasibility (A^T y >= c, y >= 0), complementary slackness and
+matching objective values. An unbounded result is certified by a ray d with A d <= 0, d >= 0 and c d > 0.
+Problems of the same shape are checked together as stacked arrays.
+"""
+
+import numpy as np
+
+
+class CertificateReport:
+    """The outcome of each certificate check, one entry per problem."""
+    def __init__(self, primal_feasible, dual_feasible, complementary, objective_matches, valid):
+        self.primal_feasible = primal_feasible
+        self.dual_feasible = dual_feasible
+        self.complementary = complementary
+        self.objective_matches = objective_matches
+        self.valid = valid
+
+
+def check_optimal_batch(coefficients, constraints, objective, solutions, duals, values, tolerance=1e-7):
+    """Checks optimality certificates for a stack of same shaped problems.
+    Takes coefficients of shape (k, m, n), constraints (k, m), objective (k, n), solutions (k, n),
+    duals (k, m) and values (k,). Tolerances are relative to the magnitude of the quantities compared."""
+    coefficients = np.asarray(coefficients, dtype='float')
+    constraints, objective, solutions, duals, values = (
+        np.asarray(array, dtype='float') for array in (constraints, objective, solutions, duals, values))
+    slack = constraints - np.einsum('kmn,kn->km', coefficients, solutions)
+    excess = np.einsum('kmn,km->kn', coefficients, duals) - objective
+    primal_feasible = (np.all(slack >= -tolerance * (1 + np.abs(constraints)), axis=1)
+                       & np.all(solutions >= -tolerance, axis=1))
+    dual_feasible = (np.all(excess >= -tolerance * (1 + np.abs(objective)), axis=1)
+                     & np.all(duals >= -tolerance, axis=1))
+    scale = 1 + np.abs(values)
+    complementary = ((np.sum(np.abs(duals * slack), axis=1) <= tolerance * scale)
+                     & (np.sum(np.abs(solutions * excess), axis=1) <= tolerance * scale))
+    primal_values = np.einsum('kn,kn->k', objective, solutions)
+    dual_values = np.einsum('km,km->k', constraints, duals)
+    objective_matches = ((np.abs(primal_values - values) <= tolerance * scale)
+                         & (np.abs(dual_values - values) <= tolerance * scale))
+    valid = primal_feasible & dual_feasible & complementary & objective_matches
+    return CertificateReport(primal_feasible, dual_feasible, complementary, objective_matches, valid)
+
+
+def check_unbounded_batch(coefficients, constraints, objective, rays, tolerance=1e-7):
+    """Checks unboundedness certificates for a stack of same shaped problems.
+    The origin is feasible when the constraints are non-negative, so a ray proves the problem unbounded."""
+    coefficients = np.asarray(coefficients, dtype='float')
+    constraints, objective, rays = (np.asarray(array, dtype='float') for array in (constraints, objective, rays))
+    scale = 1 + np.max(np.abs(rays), axis=1)
+    primal_feasible = (np.all(constraints >= -tolerance, axis=1)
+                       & np.all(np.einsum('kmn,kn->km', coefficients, rays) <= tolerance * scale[:, None], axis=1)
+                       & np.all(rays >= -tolerance, axis=1))
+    objective_matches = np.einsum('kn,kn->k', objective, rays) > tolerance * scale
+    always = np.ones(primal_feasible.shape, dtype='bool')
+    return CertificateReport(primal_feasible, always, always, objective_matches, primal_feasible & objective_matches)
+
+
+def check_results(problems, simplexes, tolerance=1e-7):
+    """Checks the certificates of run simplexes against their original (coefficients, constraints,
+    objective) problems, batching problems of the same shape and outcome. Returns one boolean per problem."""
+    valid = np.zeros(len(problems), dtype='bool')
+    groups = {}
+    for index, ((coefficients, _, _), simplex) in enumerate(zip(problems, simplexes)):
+        if simplex.is_optimal or simplex.is_unbounded:
+            groups.setdefault((np.shape(coefficients), simplex.is_unbounded), []).append(index)
+    for (shape, is_unbounded), indices in groups.items():
+        coefficients = np.stack([problems[index][0] for index in indices]).astype('float')
+        constraints = np.stack([np.ravel(problems[index][1]) for index in indices]).astype('float')
+        objective = np.stack([np.ravel(problems[index][2]) for index in indices]).astype('float')
+        if is_unbounded:
+            rays = np.stack([simplexes[index].ray.ravel() for index in indices])
+            report = check_unbounded_batch(coefficients, constraints, objective, rays, tolerance=tolerance)
+        else:
+            solutions = np.stack([simplexes[index].solution.ravel() for index in indices])
+            duals = np.stack([simplexes[index].duals.ravel() for index in indices])
+            values = np.array([simplexes[index].value for index in indices], dtype='float')
+            report = check_optimal_batch(coefficients, constraints, objective, solutions, duals, values,
+                                         tolerance=tolerance)
+        valid[indices] = report.valid
+    return valid
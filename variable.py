@@ -2,10 +2,27 @@
 
 
 class Variable:
-    """A class for identifying a simplex variable."""
+    """A class for identifying a simplex variable.
+    Simplex keeps its basis as an array of column indices; variables are lightweight views created from it."""
+    __slots__ = ('number', 'is_slack')
+
     def __init__(self, index=0, is_slack=True):
         self.number = index
         self.is_slack = is_slack
 
+    @classmethod
+    def from_column(cls, column_index, number_of_variables):
+        """Creates the variable for a tableau column, where slack columns follow the original variables."""
+        if column_index >= number_of_variables:
+            return cls(index=column_index - number_of_variables, is_slack=True)
+        return cls(index=column_index, is_slack=False)
+
+    def column(self, number_of_variables):
+        """Returns the tableau column index of the variable."""
+        return self.number + number_of_variables if self.is_slack else self.number
+
     def __eq__(self, other):
-        return self.number == other.number and self.is_slack == other.is_slack
\ No newline at end of file
+        return self.number == other.number and self.is_slack == other.is_slack
+
+    def __repr__(self):
+        return 'Variable(index={}, is_slack={})'.format(self.number, self.is_slack)